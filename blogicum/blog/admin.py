@@ -1,6 +1,8 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.db.models.functions import Substr
 
-from .models import Category, Location, Post, Comment
+from .models import MODEL_NAME_LENGTH, Category, Location, Post, Comment
 
 
 @admin.register(Location)
@@ -39,6 +41,23 @@ class CategoryAdmin(admin.ModelAdmin):
     list_display_links = ('title',)
 
 
+class PostChangeList(ChangeList):
+    """Changelist loading only the columns shown for posts."""
+
+    def get_results(self, request):
+        """Restrict columns of displayed posts."""
+        super().get_results(request)
+        self.result_list = self.result_list.only(
+            'title',
+            'pub_date',
+            'author__username',
+            'location__name',
+            'category__title',
+            'is_published',
+            'created_at',
+        )
+
+
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
     """Admin settings for Post model."""
@@ -54,11 +73,40 @@ class PostAdmin(admin.ModelAdmin):
     )
     list_editable = (
         'is_published',
-        'category',
     )
     search_fields = ('title',)
     list_filter = ('category', 'is_published',)
     list_display_links = ('title',)
+    list_select_related = ('author', 'location', 'category')
+    autocomplete_fields = ('author', 'location', 'category')
+    actions = ('recount_comments',)
+
+    @admin.action(description='Пересчитать количество комментариев')
+    def recount_comments(self, request, queryset):
+        """Recalculate comment_count of selected posts."""
+        queryset.recount_comments()
+
+    def get_changelist(self, request, **kwargs):
+        """Use changelist which loads only displayed columns."""
+        return PostChangeList
+
+
+class CommentChangeList(ChangeList):
+    """Changelist loading only the beginning of comment text.
+
+    Text is cut for the displayed page only, so row counts stay plain.
+    """
+
+    def get_results(self, request):
+        """Restrict columns and cut comment text of displayed comments."""
+        super().get_results(request)
+        self.result_list = self.result_list.only(
+            'created_at',
+            'author__username',
+            'post__title',
+        ).annotate(
+            short_text=Substr('text', 1, MODEL_NAME_LENGTH)
+        )
 
 
 @admin.register(Comment)
@@ -66,10 +114,20 @@ class CommentAdmin(admin.ModelAdmin):
     """Admin settings for Comment model."""
 
     list_display = (
-        'text',
+        'short_text',
         'author',
         'post',
         'created_at',
     )
     search_fields = ('text',)
     list_filter = ('author', 'created_at',)
+    list_select_related = ('author', 'post')
+
+    def get_changelist(self, request, **kwargs):
+        """Use changelist which cuts comment text in SQL."""
+        return CommentChangeList
+
+    @admin.display(description='Текст', ordering='text')
+    def short_text(self, obj):
+        """Return the beginning of comment text."""
+        return obj.short_text
@@ -1,6 +1,7 @@
 from django import forms
+from django.db.models import Q
 
-from blog.models import Comment, Post
+from blog.models import Category, Comment, Location, Post
 
 
 class PostForm(forms.ModelForm):
@@ -8,7 +9,15 @@ class PostForm(forms.ModelForm):
 
     class Meta:
         model = Post
-        exclude = ('author',)
+        fields = (
+            'is_published',
+            'title',
+            'text',
+            'pub_date',
+            'location',
+            'category',
+            'image',
+        )
         widgets = {
             'pub_date': forms.DateTimeInput(
                 format='%Y-%m-%d %H:%M:%S',
@@ -16,6 +25,19 @@ class PostForm(forms.ModelForm):
             )
         }
 
+    def __init__(self, *args, **kwargs):
+        """Limit location and category choices to published ones.
+
+        Current values of the edited post are kept available.
+        """
+        super().__init__(*args, **kwargs)
+        self.fields['location'].queryset = Location.objects.filter(
+            Q(is_published=True) | Q(pk=self.instance.location_id)
+        ).only('name')
+        self.fields['category'].queryset = Category.objects.filter(
+            Q(is_published=True) | Q(pk=self.instance.category_id)
+        ).only('title')
+
 
 class CommentForm(forms.ModelForm):
     """From class based on Comment model with only text field."""
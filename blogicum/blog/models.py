@@ -1,12 +1,27 @@
+from threading import local
+
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import (BooleanField, Case, Count, OuterRef, Subquery,
+                              Value, When)
+from django.db.models.functions import Coalesce
 from django.urls import reverse
+from django.utils import timezone as tz
 
 from core.models import BaseModel, PublishModel
 
 MODEL_NAME_LENGTH = 30
 User = get_user_model()
 
+_deleting_posts = local()
+
+
+def get_deleting_post_ids():
+    """Return ids of posts being deleted in the current thread."""
+    if not hasattr(_deleting_posts, 'ids'):
+        _deleting_posts.ids = set()
+    return _deleting_posts.ids
+
 
 class Location(PublishModel):
     """Category model. Adds name field."""
@@ -39,16 +54,96 @@ class Category(PublishModel):
     class Meta:
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        indexes = (
+            models.Index(
+                fields=('is_published',),
+                name='category_published_idx',
+                condition=models.Q(is_published=True),
+            ),
+        )
 
     def __str__(self):
         """Set the field title as a string representation of a class."""
         return self.title[:MODEL_NAME_LENGTH]
 
 
+class PostQuerySet(models.QuerySet):
+    """QuerySet with chainable filters for Post model."""
+
+    def with_related(self):
+        """Join related models."""
+        return self.select_related('author', 'location', 'category')
+
+    def cards(self, *, published_only=True, with_author=True):
+        """Join related models and select only columns of post cards.
+
+        Unpublished posts are excluded unless published_only is False.
+        Author is not joined if with_author is False, e.g. when all posts
+        belong to one known author.
+        """
+        fields = [
+            'title',
+            'text',
+            'pub_date',
+            'image',
+            'comment_count',
+            'is_published',
+            'location__name',
+            'location__is_published',
+            'category__title',
+            'category__slug',
+            'category__is_published',
+        ]
+        related = ['location', 'category']
+        if with_author:
+            fields.append('author__username')
+            related.append('author')
+        posts = self.select_related(*related).only(*fields)
+        return posts.published() if published_only else posts
+
+    def with_visibility(self):
+        """Annotate posts with is_visible: published and not postponed."""
+        return self.annotate(
+            is_visible=Case(
+                When(
+                    is_published=True,
+                    pub_date__lte=tz.now(),
+                    then=Value(True)
+                ),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+        )
+
+    def recount_comments(self):
+        """Recalculate comment_count from the comment table."""
+        return self.update(
+            comment_count=Coalesce(
+                Subquery(
+                    Comment.objects
+                    .filter(post=OuterRef('pk'))
+                    .order_by()
+                    .values('post')
+                    .annotate(count=Count('pk'))
+                    .values('count')[:1]
+                ),
+                0
+            )
+        )
+
+    def published(self):
+        """Exclude unpublished posts and those with unpublished category."""
+        return self.filter(
+            pub_date__lte=tz.now(),
+            is_published=True,
+            category__is_published=True
+        )
+
+
 class Post(PublishModel):
     """Post model.
 
-    Adds title, text, pub_date and image fields.
+    Adds title, text, pub_date, image and comment_count fields.
     Joins Author, Location and Category models.
     """
 
@@ -80,17 +175,65 @@ class Post(PublishModel):
         null=True,
     )
     image = models.ImageField('Фото', upload_to='post_images', blank=True)
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('-pub_date', 'is_published'),
+                name='post_pubdate_pub_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_cat_pubdate_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_pubdate_idx',
+            ),
+        )
 
     def __str__(self):
         """Set the field title as a string representation of a class."""
         return self.title[:MODEL_NAME_LENGTH]
 
+    def save(self, *args, **kwargs):
+        """Leave comment_count out of updates, signals maintain it."""
+        if (
+            not self._state.adding
+            and self.pk is not None
+            and not kwargs.get('force_insert')
+            and kwargs.get('update_fields') is None
+        ):
+            deferred_fields = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name != 'comment_count'
+                and field.attname not in deferred_fields
+            ]
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """Delete post without updating its comment_count per comment."""
+        pk = self.pk
+        deleting_post_ids = get_deleting_post_ids()
+        deleting_post_ids.add(pk)
+        try:
+            return super().delete(*args, **kwargs)
+        finally:
+            deleting_post_ids.discard(pk)
+
     def get_absolute_url(self):
         """Redefine get_absolute_url method."""
         return reverse('blog:post_detail', args=[self.pk])
@@ -116,6 +259,12 @@ class Comment(BaseModel):
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+        )
 
     def __str__(self):
         """Set the field text as a string representation of a class."""
@@ -0,0 +1,45 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from blog.models import Comment, Post, get_deleting_post_ids
+
+
+def _change_comment_count(post_id, delta):
+    """Add delta to post's comment_count, never going below zero."""
+    Post.objects.filter(pk=post_id).update(
+        comment_count=Greatest(F('comment_count') + delta, 0)
+    )
+
+
+@receiver(post_init, sender=Comment)
+def remember_comment_post(sender, instance, **kwargs):
+    """Remember loaded post_id to notice a comment moved to another post.
+
+    Deferred post_id is remembered as None and never counts as a move.
+    """
+    instance._loaded_post_id = instance.__dict__.get('post_id')
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, raw, **kwargs):
+    """Keep comment_count of affected posts in sync with saved comment."""
+    if raw:
+        Post.objects.filter(pk=instance.post_id).recount_comments()
+    elif created:
+        _change_comment_count(instance.post_id, 1)
+    elif (
+        instance._loaded_post_id is not None
+        and instance._loaded_post_id != instance.post_id
+    ):
+        _change_comment_count(instance._loaded_post_id, -1)
+        _change_comment_count(instance.post_id, 1)
+    instance._loaded_post_id = instance.__dict__.get('post_id')
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, **kwargs):
+    """Decrease post's comment_count when a comment is deleted."""
+    if instance.post_id not in get_deleting_post_ids():
+        _change_comment_count(instance.post_id, -1)
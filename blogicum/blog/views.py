@@ -1,9 +1,10 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Max
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
-from django.utils import timezone as tz
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
                                   UpdateView)
 from django.views.generic.detail import BaseDetailView
@@ -12,46 +13,8 @@ from blog.forms import CommentForm, PostForm
 from blog.models import Category, Comment, Post, User
 
 POSTS_PER_PAGE = 10
-
-
-class PostObjects:
-    """Class encapsulates manipulations with the queryset of Post model."""
-
-    posts = Post.objects
-
-    def add_related(self):
-        """Join related models."""
-        self.posts = self.posts.select_related(
-            'author', 'location', 'category'
-        )
-        return self
-
-    def add_comments(self):
-        """Annotate posts with comments."""
-        self.posts = (
-            self.posts
-            .annotate(comment_count=Count('comments'))
-            .order_by('-pub_date')
-        )
-        return self
-
-    def exclude_unpublished(self):
-        """Exclude unpublished posts and those with unpublished category."""
-        self.posts = self.posts.filter(
-            pub_date__lte=tz.now(),
-            is_published=True,
-            category__is_published=True
-        )
-        return self
-
-    def apply_all_filters(self):
-        """Apply filters: add related, add comments, exclude unpublished."""
-        self.add_related().add_comments().exclude_unpublished()
-        return self
-
-    def get_all(self):
-        """Return queryset of posts."""
-        return self.posts
+COMMENTS_PER_PAGE = 20
+INDEX_CACHE_TIMEOUT = 60
 
 
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -71,17 +34,31 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         return reverse('blog:profile', args=[self.request.user.username])
 
 
-class PostObjectMixin(BaseDetailView, PostObjects):
+class PostObjectMixin(BaseDetailView):
     """Define post model attribute and get_object method."""
 
     model = Post
+    _object_cache = None
 
-    def get_object(self, queryset=None):
-        """Reduce the amount of queries to database."""
-        return get_object_or_404(
-            self.add_related().get_all(),
-            pk=self.kwargs.get('post_id')
-        )
+    def get_queryset(self):
+        """Join related models."""
+        return Post.objects.with_related()
+
+    def get_object(self, queryset=None, owner_only=False):
+        """Fetch the post once per request and reuse it afterwards.
+
+        With owner_only set, posts of other authors are not found.
+        """
+        if self._object_cache is None:
+            if queryset is None:
+                queryset = self.get_queryset()
+            if owner_only:
+                queryset = queryset.filter(author=self.request.user)
+            self._object_cache = get_object_or_404(
+                queryset,
+                pk=self.kwargs.get('post_id')
+            )
+        return self._object_cache
 
 
 class PostDetailView(PostObjectMixin, DetailView):
@@ -89,23 +66,27 @@ class PostDetailView(PostObjectMixin, DetailView):
 
     template_name = 'blog/detail.html'
 
+    def get_queryset(self):
+        """Annotate the post with its visibility."""
+        return super().get_queryset().with_visibility()
+
     def dispatch(self, request, *args, **kwargs):
         """Allow only post creator to see a post which isn't published."""
-        post = self.get_object()
-        if (
-            post.author != request.user
-            and (
-                not post.is_published
-                or post.pub_date > tz.now()
-            )
-        ):
+        self.object = self.get_object()
+        if self.object.author != request.user and not self.object.is_visible:
             raise Http404
         return super().dispatch(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs):
-        """Add form and comments to context."""
+        """Add comment form and a page of comments to context."""
         context = super().get_context_data(**kwargs)
-        context['comments'] = self.object.comments.select_related('author')
+        paginator = Paginator(
+            self.object.comments
+            .select_related('author')
+            .only('text', 'created_at', 'post', 'author__username'),
+            COMMENTS_PER_PAGE
+        )
+        context['comments'] = paginator.get_page(self.request.GET.get('page'))
         context['form'] = CommentForm()
         return context
 
@@ -117,8 +98,13 @@ class PostProtectedMixin(LoginRequiredMixin, PostObjectMixin):
 
     def dispatch(self, request, *args, **kwargs):
         """Protect post by owner checking."""
-        if self.get_object().author != request.user:
-            return redirect('blog:post_detail', kwargs['post_id'])
+        if request.user.is_authenticated:
+            try:
+                self.object = self.get_object(owner_only=True)
+            except Http404:
+                if not Post.objects.filter(pk=kwargs['post_id']).exists():
+                    raise
+                return redirect('blog:post_detail', kwargs['post_id'])
 
         return super().dispatch(request, *args, **kwargs)
 
@@ -173,24 +159,40 @@ class CommentProtectedView(LoginRequiredMixin, BaseDetailView):
     model = Comment
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
+    _object_cache = None
 
     def dispatch(self, request, *args, **kwargs):
         """Protect comment by owner checking."""
-        if self.get_object().author != request.user:
-            return redirect('blog:post_detail', kwargs['post_id'])
+        if request.user.is_authenticated:
+            try:
+                self.object = self.get_object(owner_only=True)
+            except Http404:
+                comments = Comment.objects.filter(pk=kwargs['comment_id'])
+                if not comments.exists():
+                    raise
+                return redirect('blog:post_detail', kwargs['post_id'])
 
         return super().dispatch(request, *args, **kwargs)
 
-    def get_object(self, queryset=None):
-        """Reduce the amount of queries to database."""
-        return get_object_or_404(
-            Comment.objects.select_related('author'),
-            pk=self.kwargs.get('comment_id')
-        )
+    def get_object(self, queryset=None, owner_only=False):
+        """Fetch the comment once per request and reuse it afterwards.
+
+        With owner_only set, comments of other authors are not found.
+        """
+        if self._object_cache is None:
+            if queryset is None:
+                queryset = self.get_queryset()
+            if owner_only:
+                queryset = queryset.filter(author=self.request.user)
+            self._object_cache = get_object_or_404(
+                queryset,
+                pk=self.kwargs.get('comment_id')
+            )
+        return self._object_cache
 
     def get_success_url(self, **kwargs):
         """Redefine success_url to post detail page."""
-        return reverse('blog:post_detail', args=[self.object.post.pk])
+        return reverse('blog:post_detail', args=[self.object.post_id])
 
 
 class CommentUpdateView(CommentProtectedView, UpdateView):
@@ -202,10 +204,12 @@ class CommentUpdateView(CommentProtectedView, UpdateView):
 class CommentDeleteView(CommentProtectedView, DeleteView):
     """DeleteView class for deleting comments."""
 
-    pass
+    def get_queryset(self):
+        """Select only the columns needed for delete confirmation."""
+        return Comment.objects.only('text', 'author', 'post')
 
 
-class CategoryPostsListView(ListView, PostObjects):
+class CategoryPostsListView(ListView):
     """ListView class with posts in particular category."""
 
     model = Post
@@ -221,9 +225,8 @@ class CategoryPostsListView(ListView, PostObjects):
             is_published=True
         )
         return (
-            self
-            .apply_all_filters()
-            .get_all()
+            Post.objects
+            .cards()
             .filter(category=self.category)
         )
 
@@ -234,7 +237,7 @@ class CategoryPostsListView(ListView, PostObjects):
         return context
 
 
-class ProfilePostsListView(ListView, PostObjects):
+class ProfilePostsListView(ListView):
     """ListView class with posts created by particular author."""
 
     model = Post
@@ -245,16 +248,25 @@ class ProfilePostsListView(ListView, PostObjects):
     def get_queryset(self):
         """Set author attribute and rewrite queryset."""
         self.author = get_object_or_404(
-            User,
+            User.objects.only(
+                'username',
+                'first_name',
+                'last_name',
+                'email',
+                'date_joined',
+                'is_staff',
+            ),
             username=self.kwargs.get('username')
         )
 
-        posts = self.add_related().add_comments()
         return (
-            posts.get_all()
-            if self.request.user == self.author
-            else posts.exclude_unpublished().get_all()
-        ).filter(author=self.author)
+            Post.objects
+            .cards(
+                published_only=self.request.user != self.author,
+                with_author=False
+            )
+            .filter(author=self.author)
+        )
 
     def get_context_data(self, **kwargs):
         """Add user model to context."""
@@ -285,4 +297,30 @@ class IndexListView(ListView):
     model = Post
     template_name = 'blog/index.html'
     paginate_by = POSTS_PER_PAGE
-    queryset = PostObjects().apply_all_filters().get_all()
+
+    def get(self, request, *args, **kwargs):
+        """Serve anonymous visitors a cached page until a new post appears.
+
+        Pages requested by name (e.g. 'last') are not cached.
+        """
+        try:
+            page_number = int(request.GET.get(self.page_kwarg, 1))
+        except ValueError:
+            page_number = None
+        if request.user.is_authenticated or page_number is None:
+            return super().get(request, *args, **kwargs)
+
+        latest = Post.objects.published().aggregate(
+            latest=Max('pub_date')
+        )['latest']
+        latest = latest.timestamp() if latest else None
+        key = f'blog:index:{latest}:{page_number}'
+        response = cache.get(key)
+        if response is None:
+            response = super().get(request, *args, **kwargs).render()
+            cache.set(key, response, INDEX_CACHE_TIMEOUT)
+        return response
+
+    def get_queryset(self):
+        """Return published posts, evaluating current time per request."""
+        return Post.objects.cards()
@@ -0,0 +1,138 @@
+import pytest
+from django.core import serializers
+from django.db import connection, transaction
+from django.db.models.signals import pre_delete
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_comment_count(post: Post) -> int:
+    return Post.objects.get(pk=post.pk).comment_count
+
+
+def test_comment_count_create_and_delete(
+    mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(2).blend("blog.Comment", post=post)
+    assert get_comment_count(post) == 2, (
+        "Убедитесь, что при создании комментария увеличивается"
+        " `comment_count` поста."
+    )
+    comments[0].delete()
+    assert get_comment_count(post) == 1, (
+        "Убедитесь, что при удалении комментария уменьшается"
+        " `comment_count` поста."
+    )
+
+
+def test_comment_count_not_negative(
+    mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+    comment.delete()
+    assert get_comment_count(post) == 0, (
+        "Убедитесь, что `comment_count` поста не становится отрицательным."
+    )
+
+
+def test_comment_count_move(
+    mixer: Mixer, post_with_published_location, post_of_another_author
+):
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    comment = Comment.objects.get(pk=comment.pk)
+    comment.post = post_of_another_author
+    comment.save()
+    assert get_comment_count(post_with_published_location) == 0
+    assert get_comment_count(post_of_another_author) == 1, (
+        "Убедитесь, что при переносе комментария в другой пост"
+        " `comment_count` обоих постов обновляется."
+    )
+    comment.delete()
+    assert get_comment_count(post_of_another_author) == 0
+
+
+def test_comment_count_raw_save(mixer: Mixer, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post)
+    data = serializers.serialize("json", [comment])
+    comment.delete()
+    for obj in serializers.deserialize("json", data):
+        obj.save()
+    assert get_comment_count(post) == 1, (
+        "Убедитесь, что комментарии, загруженные из фикстур,"
+        " учитываются в `comment_count` поста."
+    )
+
+
+def test_post_delete_skips_comment_count_update(
+    mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    with CaptureQueriesContext(connection) as queries:
+        post.delete()
+    assert not [
+        query for query in queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ], (
+        "Убедитесь, что при удалении поста его комментарии не обновляют"
+        " `comment_count` удаляемого поста."
+    )
+
+
+def test_stale_post_save_keeps_comment_count(
+    mixer: Mixer, post_with_published_location
+):
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    mixer.blend("blog.Comment", post=post)
+    post.title = "Новый заголовок"
+    post.save()
+    assert get_comment_count(post) == 1, (
+        "Убедитесь, что сохранение поста не перезаписывает"
+        " `comment_count` устаревшим значением."
+    )
+
+
+def test_deferred_comment_save_keeps_comment_count(
+    mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post)
+    comment = Comment.objects.only("text").get(pk=comment.pk)
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    assert get_comment_count(post) == 1, (
+        "Убедитесь, что сохранение комментария без загруженного поля"
+        " `post` не меняет `comment_count` поста."
+    )
+
+
+def test_failed_post_delete_keeps_comment_count_updates(
+    mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post)
+
+    def fail_delete(sender, instance, **kwargs):
+        raise RuntimeError
+
+    pre_delete.connect(fail_delete, sender=Post)
+    try:
+        with pytest.raises(RuntimeError), transaction.atomic():
+            post.delete()
+    finally:
+        pre_delete.disconnect(fail_delete, sender=Post)
+    comment.delete()
+    assert get_comment_count(post) == 0, (
+        "Убедитесь, что после неудачного удаления поста удаление его"
+        " комментариев уменьшает `comment_count`."
+    )
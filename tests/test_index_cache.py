@@ -0,0 +1,51 @@
+import warnings
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_index_cache_invalidated_by_new_post(
+    mixer: Mixer, unlogged_client, user, published_category
+):
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=2),
+        title="Старый пост",
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", CacheKeyWarning)
+        first_content = unlogged_client.get("/").content.decode()
+        assert unlogged_client.get("/?page=01").content.decode() == (
+            first_content
+        )
+    assert "Старый пост" in first_content
+
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+        title="Новый пост",
+    )
+    content = unlogged_client.get("/").content.decode()
+    assert "Новый пост" in content, (
+        "Убедитесь, что после публикации нового поста главная страница"
+        " показывает его анонимным пользователям."
+    )
@@ -0,0 +1,27 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_detail_queries(client, post) -> int:
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == 200
+    return len(queries)
+
+
+def test_post_detail_queries_do_not_grow_with_comments(
+    mixer: Mixer, unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post)
+    queries_with_one_comment = count_detail_queries(unlogged_client, post)
+    mixer.cycle(4).blend("blog.Comment", post=post)
+    queries_with_many_comments = count_detail_queries(unlogged_client, post)
+    assert queries_with_one_comment == queries_with_many_comments == 3, (
+        "Убедитесь, что количество запросов к базе данных на странице поста"
+        " не зависит от количества комментариев."
+    )